@@ -1,6 +1,9 @@
 from ortools.sat.python import cp_model
 from ortools.sat.python.cp_model import IntVar
 import ortools
+import os
+import numpy as np
+import pandas as pd
 from datetime import date, timedelta
 from enum import IntEnum, auto
 from functools import partial
@@ -25,71 +28,80 @@ class ResidentSchedulingSolver:
                  holidays: list[int] = [],
                  shifts: list[str] = ['day', 'night'],
                  classification: str = 'junior',
+                 max_time_seconds: float | None = None,
+                 target_gap: float = 0.05,
+                 warm_start_solution: dict[tuple[str, int, str], int] | None = None,
                 ) -> None:
 
         self.classification = classification
+        self.max_time_seconds = max_time_seconds
+        self.target_gap = target_gap
+        self.warm_start_solution = warm_start_solution or {}
         self.num_days = num_days
         self.trauma_shift_multiplier = 2
         self.shifts = shifts
         self.shifts_per_day = len(self.shifts)
+        self.shift_idx = {shift: index for index, shift in enumerate(self.shifts)}
         self.max_shifts_per_week = max_shifts_per_week
         self.extra_friday_penalty_amount = extra_friday_penalty
         self.half_day_call_penalty = 2
         self.days = list(range(num_days))
         self.schedules = {}  # To store the schedule of each resident
+        # Transposed view of the schedules: every resident's variable for a given
+        # (day, shift) slot, collected as the variables are created.
+        self.day_shift_roster = [[[] for _ in self.shifts] for _ in self.days]
         if residents_info:
             for resident in residents_info:
                 self.add_resident_info(**resident)
         self.nofill = nofill
+        self.nofill_set = frozenset(nofill)
         self.num_nofill = len(self.nofill)
         self.days_to_fill = self.num_days - len(self.nofill)
         self.start_date = date.fromisoformat(start_date)
 
-        def build_weekday_list(weekday: Weekday):
-            return [weekday for weekday in range(weekday, num_days, len(Weekday))]
-
-        mondays = build_weekday_list(Weekday.MONDAY)
-        tuesdays = build_weekday_list(Weekday.TUESDAY)
-        wednesdays = build_weekday_list(Weekday.WEDNESDAY)
-        thursdays = build_weekday_list(Weekday.THURSDAY)
-        fridays = build_weekday_list(Weekday.FRIDAY)  # TODO: Anything relative to Friday should probably be associated with the last working day of the week.
-        saturdays = build_weekday_list(Weekday.SATURDAY)
-        sundays = build_weekday_list(Weekday.SUNDAY)
+        # Memoized per-weekday day lists so constraint builders don't re-filter
+        # self.days with modulo arithmetic once per resident.
+        self.days_by_weekday = [list(range(weekday, num_days, len(Weekday))) for weekday in Weekday]
+        # TODO: Anything relative to Friday should probably be associated with the last working day of the week.
 
         weekdays = []
-        for days in [mondays, tuesdays, wednesdays, thursdays, fridays]:
-            weekdays.extend(days)
+        for weekday in [Weekday.MONDAY, Weekday.TUESDAY, Weekday.WEDNESDAY, Weekday.THURSDAY, Weekday.FRIDAY]:
+            weekdays.extend(self.days_by_weekday[weekday])
         weekends = []
-        for days in [saturdays, sundays]:
-            weekends.extend(days)
-        self.working_days = weekdays.copy()
-        self.weekends_and_holidays = weekends.copy()
+        for weekday in [Weekday.SATURDAY, Weekday.SUNDAY]:
+            weekends.extend(self.days_by_weekday[weekday])
+        self.working_days_set = set(weekdays)
+        self._weekends_set = set(weekends)
+        self._working_days_sorted = None
+        self._weekends_sorted = None
         if holidays:
             for holiday in holidays:
                 self.add_holiday(holiday)
         
         self.model = cp_model.CpModel()
-    
-    def assign_claimed_days(self, resident):
-        """
-        For any person and shift listed in 'claimed_days', assign that individual to that shift.
-        """
-        for day, shift in resident['claimed_days']:
-            try:
-                self.model.Add(self.schedules[resident['name']][day][shift] == 1)
-            except Exception as e:
-                print("{resident=}\n{day=}\n{shift=}")
-                raise e
+
+    @property
+    def working_days(self):
+        if self._working_days_sorted is None:
+            self._working_days_sorted = sorted(self.working_days_set)
+        return self._working_days_sorted
+
+    @property
+    def weekends_and_holidays(self):
+        if self._weekends_sorted is None:
+            self._weekends_sorted = sorted(self._weekends_set)
+        return self._weekends_sorted
 
     def add_holiday(self, day: int):
         """
         Add a holiday to use in the weekend/weekday ratio calculations.
-        remove the holiday from the working_days list and add it to the weekends_and_holidays list
+        Move the holiday from the working-day set to the weekend set; the sorted
+        views are rebuilt lazily the next time they're read.
         """
-        self.working_days.remove(day)
-        self.weekends_and_holidays.append(day)
-        self.working_days.sort()
-        self.weekends_and_holidays.sort()
+        self.working_days_set.discard(day)
+        self._weekends_set.add(day)
+        self._working_days_sorted = None
+        self._weekends_sorted = None
 
     def add_resident_info(self, 
                           name: str, 
@@ -112,12 +124,12 @@ class ResidentSchedulingSolver:
         self.residents_info.append({
             "name": name,
             "on_vacation_days": on_vacation_days,
+            "on_vacation_set": frozenset(on_vacation_days),
             "on_trauma": on_trauma,
             "on_emergency": on_emergency,
             "days_override": days_override,
             "claimed_days": claimed_days,
         })
-        self.calculate_call_ratio()
 
     def calculate_call_ratio(self):
         """
@@ -139,23 +151,20 @@ class ResidentSchedulingSolver:
         """
         Make sure that [calculation] is between [lower] and [upper] bounds.  Use [Bounded descriptor] for any field labeling
         @param calculation: The result of the calculation that would go into a NewIntVar type from OR-tools.
-        @param lower_bound: An integer representing the lowest possible value.  This value will receive a penalty of 1 if it is reached.
-        @param upper_bound: An integer representing the highest possible value.  This value will receive a penalty of 1 if it is reached.
+        @param lower_bound: An integer representing the lowest possible value.
+        @param upper_bound: An integer representing the highest possible value.
         @param bounded_descriptor: A string to signify the type of bound that is being established.  This must be unique.
         """
         print(f"Target {bounded_descriptor} for {resident['name']}: {lower_bound} < x < {upper_bound}")
-        shifts_taken = self.model.NewIntVar(0, len(self.days), f"{bounded_descriptor}_taken_{resident['name']}")
-        lower_bound_reached = self.model.NewBoolVar(f"{bounded_descriptor}_lower_bound_{resident['name']}")
-        upper_bound_reached = self.model.NewBoolVar(f"{bounded_descriptor}_upper_bound_{resident['name']}")
-        self.model.Add(shifts_taken == calculation)
-        self.model.Add(shifts_taken >= lower_bound)
-        self.model.Add(shifts_taken <= upper_bound)
-        self.model.Add(shifts_taken == lower_bound).OnlyEnforceIf(lower_bound_reached)
-        self.model.Add(shifts_taken == upper_bound).OnlyEnforceIf(upper_bound_reached)
-        self.model.Add(shifts_taken != lower_bound).OnlyEnforceIf(lower_bound_reached.Not())
-        self.model.Add(shifts_taken != upper_bound).OnlyEnforceIf(upper_bound_reached.Not())
-        self.penalties.append(lower_bound_reached)
-        self.penalties.append(upper_bound_reached)
+        # Penalize distance from the centre of the band so the edges are discouraged
+        # without the reified equality bookkeeping of the previous version.
+        target = (lower_bound + upper_bound) // 2
+        dev = self.model.NewIntVar(0, len(self.days), f"dev_{bounded_descriptor}_{resident['name']}")
+        self.model.Add(dev >= calculation - target)
+        self.model.Add(dev >= target - calculation)
+        self.model.Add(calculation >= lower_bound)
+        self.model.Add(calculation <= upper_bound)
+        self.penalty_terms.append((dev, 1))
 
     def balance_trauma_call(self, resident):
         """
@@ -169,22 +178,22 @@ class ResidentSchedulingSolver:
             if tr_resident['on_trauma']:
                 num_trauma_residents += 1
                 for day in self.working_days:
-                    if day not in tr_resident['on_vacation_days']:
+                    if day not in tr_resident['on_vacation_set']:
                         trauma_days_available += 1
         trauma_days_ratio = num_trauma_days / trauma_days_available
         num_away_days = 0
         for day in self.days:
-            if day in resident['on_vacation_days']:
+            if day in resident['on_vacation_set']:
                 num_away_days += 1
         for day in self.working_days:
-            if day not in resident['on_vacation_days']:
+            if day not in resident['on_vacation_set']:
                 expected_day_shifts = (num_trauma_days - num_away_days) \
                                             * trauma_days_ratio
         trauma_upper_bound = int(expected_day_shifts + 1)
         trauma_lower_bound = int(expected_day_shifts - 1)
         self.strictly_bounded(
             resident,
-            calculation=sum(self.schedules[resident['name']][day][self.shifts[0]] for day in self.working_days),
+            calculation=sum(self.schedules[resident['name']][day][0] for day in self.working_days),
             lower_bound=trauma_lower_bound,
             upper_bound=trauma_upper_bound,
             bounded_descriptor="trauma_shifts"
@@ -196,9 +205,9 @@ class ResidentSchedulingSolver:
         """
         # If on rotation from emergency, cannot be on call on Wednesdays
         if resident["on_emergency"]:
-            for day in [day for day in self.working_days if day % len(Weekday) == Weekday.WEDNESDAY]:
-                for shift in self.shifts:
-                    self.model.Add(self.schedules[resident['name']][day][shift] == 0)
+            for day in [day for day in self.days_by_weekday[Weekday.WEDNESDAY] if day in self.working_days_set]:
+                for shift_var in self.schedules[resident['name']][day]:
+                    self.model.Add(shift_var == 0)
 
     def trauma_day_call(self, resident):
         """
@@ -207,7 +216,7 @@ class ResidentSchedulingSolver:
         # Only residents on trauma rotation can work day-call
         if not resident["on_trauma"]:
             for day in self.working_days:
-                self.model.Add(self.schedules[resident['name']][day][self.shifts[0]] == 0)
+                self.model.Add(self.schedules[resident['name']][day][0] == 0)
 
     def post_call_days(self, resident, ignore: int = None):
         """
@@ -217,10 +226,11 @@ class ResidentSchedulingSolver:
         name = resident['name']
         for day in range(self.num_days - 1):
             if day % 7 != ignore:
-                for shift in self.shifts:
-                    self.model.AddAtMostOne(self.schedules[name][day]    [self.shifts[-1]],
-                                            self.schedules[name][day + 1][shift]
-                                            )
+                # One aggregate per day: a night shift zeroes out every shift the next
+                # day, while leaving the next day unconstrained otherwise.
+                self.model.Add(self.shifts_per_day * self.schedules[name][day][-1]
+                               + sum(self.schedules[name][day + 1])
+                               <= self.shifts_per_day)
 
     def prefer_full_day_call(self, resident):
         """
@@ -229,68 +239,60 @@ class ResidentSchedulingSolver:
         """
         name = resident['name']
         for day in self.days:
-            full_day_preference_violated = self.model.NewBoolVar(f'full_day_{name}_{day}')
-            half_day_penalty = self.model.NewIntVar(0, 16, f"penalty_{name}_halfday_{day}")
-            # self.model.AddBoolAnd([self.schedules[name][day][shift] for shift in self.shifts]).OnlyEnforceIf(full_day_preference_violated.Not())
-            self.model.AddBoolXOr([
-                self.schedules[name][day][self.shifts[0]], #TODO: Make this accept an arbitrary number of shifts
-                self.schedules[name][day][self.shifts[-1]], 
-                full_day_preference_violated.Not()])  # If morning or evening call but not both, trigger penalty.  Function does not support "OnlyEnforceIf", so we need to place the control boolean inside of the XOr
-            self.model.Add(half_day_penalty >= self.half_day_call_penalty).OnlyEnforceIf(full_day_preference_violated)
-            self.penalties.append(half_day_penalty)
+            first_shift = self.schedules[name][day][0]  #TODO: Make this accept an arbitrary number of shifts
+            last_shift = self.schedules[name][day][-1]
+            half_day = self.model.NewBoolVar(f'half_day_{name}_{day}')
+            # half_day is forced to 1 exactly when only one of the two shifts is taken;
+            # minimization keeps it at 0 otherwise, so no upper-bounding constraints are needed.
+            self.model.Add(half_day >= first_shift - last_shift)
+            self.model.Add(half_day >= last_shift - first_shift)
+            self.penalty_terms.append((half_day, self.half_day_call_penalty))
 
     def friday_implies_sunday(self, resident):
         """
         Evening call on Friday will result in call on Sunday.
         """
-        for day in self.days:
-            if day % 7 == Weekday.FRIDAY:  # FOR JUNIORS ONLY: Friday night implies Sunday FULL DAY call as well
-                for shift in self.shifts:
-                    self.model.AddImplication(self.schedules[resident['name']][day]  [self.shifts[-1]], 
-                                              self.schedules[resident['name']][day+2][shift])
+        for day in self.days_by_weekday[Weekday.FRIDAY]:  # FOR JUNIORS ONLY: Friday night implies Sunday FULL DAY call as well
+            friday_night = self.schedules[resident['name']][day][-1]
+            sunday_total = sum(self.schedules[resident['name']][day+2])
+            self.model.Add(sunday_total >= self.shifts_per_day * friday_night)
 
     def friday_implies_saturday(self, resident):
         """
         Evening call on Friday will result in call on Saturday.
         """
-        for day in self.days:
-            if day % 7 == Weekday.FRIDAY:
-                for shift in self.shifts:
-                    self.model.AddImplication(self.schedules[resident['name']][day]  [self.shifts[-1]], 
-                                              self.schedules[resident['name']][day+1][shift])
+        for day in self.days_by_weekday[Weekday.FRIDAY]:
+            friday_night = self.schedules[resident['name']][day][-1]
+            saturday_total = sum(self.schedules[resident['name']][day+1])
+            self.model.Add(saturday_total >= self.shifts_per_day * friday_night)
 
     def multiday_implication(self, resident, first, second):
         """
         If the first day is taken, ensure they fill the second shift as well.
         """
         day_gap = (second - first) % 7
-        for day in self.days:
-            if day % 7 == first:
-                for shift in self.shifts:
-                    self.model.AddImplication(self.schedules[resident['name']][day]          [self.shifts[-1]], 
-                                              self.schedules[resident['name']][day + day_gap][shift])
+        for day in self.days_by_weekday[first]:
+            first_night = self.schedules[resident['name']][day][-1]
+            second_total = sum(self.schedules[resident['name']][day + day_gap])
+            self.model.Add(second_total >= self.shifts_per_day * first_night)
 
     def penalize_multiple_fridays(self, resident):
         """
         Friday call is very disruptive to weekends, especially given the implied multi-day call.  Add a penalty to discourage assignment of multiple fridays.
         """
         name = resident['name']
-        for friday in [day for day in self.days if day % 7 == Weekday.FRIDAY]:
+        for friday in self.days_by_weekday[Weekday.FRIDAY]:
             other_friday = friday + len(Weekday)
             if other_friday not in self.days:
                 continue
             friday_conflict = self.model.NewBoolVar(f"{name}_Fridays_{friday}_{other_friday}")
-            friday_penalty = self.model.NewIntVar(0, 16, f"penalty_{name}_Fridays_{friday}_{other_friday}")
-            self.model.AddBoolAnd(
-                self.schedules[name][friday]      [self.shifts[-1]], 
-                self.schedules[name][other_friday][self.shifts[-1]]
-                ).OnlyEnforceIf(friday_conflict)  # If both items are assigned, then friday_conflicts will be positive.
-            # self.model.AddBoolOr(
-            #     self.schedules[name][friday]      [self.shifts[-1]].Not(), 
-            #     self.schedules[name][other_friday][self.shifts[-1]].Not()
-            #     ).OnlyEnforceIf(friday_conflict.Not())  # If either friday does not conflict, then at least one must be not booked.
-            self.model.Add(friday_penalty >= self.extra_friday_penalty_amount).OnlyEnforceIf(friday_conflict)
-            self.penalties.append(friday_penalty)
+            # friday_conflict is forced to 1 when both Friday nights are booked;
+            # minimization keeps it at 0 otherwise.  The old reified AddBoolAnd only
+            # constrained the shifts when the solver chose to raise the flag, which
+            # it never had to, so the penalty could always be dodged.
+            self.model.Add(friday_conflict >= self.schedules[name][friday][-1]
+                           + self.schedules[name][other_friday][-1] - 1)
+            self.penalty_terms.append((friday_conflict, self.extra_friday_penalty_amount))
 
     def disperse_call(self, resident):
         """
@@ -301,23 +303,12 @@ class ResidentSchedulingSolver:
         for week in range(self.num_days//len(Weekday)):
             start_day = week * 7
             end_day = start_day + 7
-            weekly_calls = sum(self.schedules[name][day][am_pm] for day in range(start_day, end_day) for am_pm in self.shifts)
-            exceeds_max_calls = self.model.NewBoolVar(f"{name}_week_{week}_exceeds_max")
-            self.model.Add(weekly_calls <= self.max_shifts_per_week).OnlyEnforceIf(exceeds_max_calls.Not())
-            self.model.Add(weekly_calls > self.max_shifts_per_week).OnlyEnforceIf(exceeds_max_calls)
-
-            weekly_penalty = self.model.NewIntVar(0, 7, f"Week_{week}_penalty_{name}")
-
+            weekly_calls = sum(shift_var for day in range(start_day, end_day) for shift_var in self.schedules[name][day])
             # penalize going over the max days per week, but don't fully restrict it.
-            for i in range(self.max_shifts_per_week + 1, 7):
-                weekly_exceeds_i = self.model.NewBoolVar(f"Week_{week}_penalty_{name}_exceeds_{i}")
-                self.model.Add(weekly_calls >= i).OnlyEnforceIf(weekly_exceeds_i)
-                self.model.Add(weekly_penalty >= 2 * i).OnlyEnforceIf(weekly_exceeds_i)
-                self.penalties.append(weekly_penalty)
-            # weekly_calls = max(0, weekly_calls - 2)
-            # self.model.Add(weekly_penalty == weekly_calls)
-            # # penalty = self.model.NewIntVar(0, 2**4, f"Week {week} penalty for {name}")
-            # # self.model.Add(penalty == weekly_calls)
+            # over = max(0, weekly_calls - max_shifts_per_week); the domain lower bound supplies the 0 side.
+            over = self.model.NewIntVar(0, 7, f"over_{name}_{week}")
+            self.model.Add(over >= weekly_calls - self.max_shifts_per_week)
+            self.penalty_terms.append((over, 2))
 
     def set_shift_expectations(self, resident):
         """
@@ -336,7 +327,7 @@ class ResidentSchedulingSolver:
         print(f"Expected shifts for {resident['name']}: {expected_night_shifts}")
         self.strictly_bounded(
             resident=resident,
-            calculation=sum(self.schedules[resident['name']][day][self.shifts[-1]] for day in self.days),
+            calculation=sum(self.schedules[resident['name']][day][-1] for day in self.days),
             lower_bound=lower_bound,
             upper_bound=upper_bound,
             bounded_descriptor="total_shifts"
@@ -349,35 +340,62 @@ class ResidentSchedulingSolver:
 
         self.strictly_bounded(
             resident=resident,
-            calculation=sum(self.schedules[resident['name']][day][self.shifts[0]] for day in self.weekends_and_holidays),
+            calculation=sum(self.schedules[resident['name']][day][0] for day in self.weekends_and_holidays),
             lower_bound=weekend_lower_bound,
             upper_bound=weekend_upper_bound,
             bounded_descriptor="weekend_shift"
         )
 
-    def cant_book_vacation_days(self, resident):
+    def fix_known_assignments(self, resident):
         """
-        Residents on vacation cannot be put on call.
+        Fix shift variables whose values are already known: claimed days are pinned
+        to 1, while vacation and nofill days are pinned to 0.  Fixing the domain
+        directly means the solver never sees these as decisions, instead of posting
+        one equality constraint per variable.
         """
-        # If on vacation, cannot be on call
+        name = resident['name']
+        claimed = {(day, self.shift_idx[shift]) for day, shift in resident['claimed_days']}
+        blocked = self.nofill_set | resident['on_vacation_set']
         for day in self.days:
-            if day in resident["on_vacation_days"]:
-                for shift in self.shifts:
-                    self.model.Add(self.schedules[resident['name']][day][shift] == 0)
-    
-    def cant_book_nofill_days(self, resident):
-        for day in self.nofill:
-            for shift in self.shifts:
-                self.model.Add(self.schedules[resident['name']][day][shift] == 0)
+            for shift_index in range(self.shifts_per_day):
+                shift_var = self.schedules[name][day][shift_index]
+                if (day, shift_index) in claimed:
+                    shift_var.Proto().domain[:] = [1, 1]
+                    self.model.AddHint(shift_var, 1)
+                elif day in blocked:
+                    shift_var.Proto().domain[:] = [0, 0]
+                    self.model.AddHint(shift_var, 0)
+
+    def hint_warm_start(self, resident):
+        """
+        Seed the search with assignments from a previous run, if one was supplied.
+        These are hints rather than constraints, so the solver is free to override
+        any of them.
+        """
+        name = resident['name']
+        for (hint_name, day, shift), value in self.warm_start_solution.items():
+            if hint_name == name:
+                shift_var = self.schedules[name][day][self.shift_idx[shift]]
+                domain = shift_var.Proto().domain
+                if domain[0] == domain[1]:
+                    continue  # Already fixed (and hinted) by fix_known_assignments.
+                self.model.AddHint(shift_var, value)
 
     def add_resident_model(self, resident, build_functions: list):
         """
         Add fields to the model based on the attributes of the resident provided in the resident parameter, and apply to functions passed through the "build_functions" parameter.
         """
         name = resident["name"]
-        self.schedules[name] = [
-            {shift: self.model.NewBoolVar(f'call_{name}_{day}_{shift}') for shift in self.shifts} for day in self.days
-        ]
+        # Create all of this resident's shift variables in one bulk call rather than
+        # crossing the pybind boundary once per (day, shift) pair.
+        shift_vars = self.model.NewBoolVarSeries(
+            f'call_{name}_',
+            pd.MultiIndex.from_product([self.days, self.shifts], names=['day', 'shift'])
+        )
+        self.schedules[name] = [tuple(shift_vars[day]) for day in self.days]
+        for day in self.days:
+            for shift_index in range(self.shifts_per_day):
+                self.day_shift_roster[day][shift_index].append(self.schedules[name][day][shift_index])
 
         for func in build_functions:
             func(resident)
@@ -387,30 +405,34 @@ class ResidentSchedulingSolver:
             self.balance_trauma_call(resident)
 
     def setup_model(self):
+        # The ratio only depends on the full roster, so compute it once here rather
+        # than after every add_resident_info call.
+        self.calculate_call_ratio()
+
         # Create a schedule variable for each resident for each day
-        self.penalties = []
+        self.penalty_terms = []  # (variable, weight) pairs feeding the objective
 
         junior_build_functions = [
-            self.emergency_wednesday_halfday, 
-            self.cant_book_vacation_days,
-            self.trauma_day_call, 
-            self.post_call_days, 
+            self.fix_known_assignments,
+            self.hint_warm_start,
+            self.emergency_wednesday_halfday,
+            self.trauma_day_call,
+            self.post_call_days,
             self.prefer_full_day_call,
             self.penalize_multiple_fridays,
-            self.disperse_call, 
+            self.disperse_call,
             self.set_shift_expectations,
             self.friday_implies_sunday,
-            self.assign_claimed_days,
         ]
 
         senior_build_functions = [
-            self.cant_book_vacation_days,
+            self.fix_known_assignments,
+            self.hint_warm_start,
             partial(self.post_call_days, ignore=Weekday.FRIDAY),
             self.penalize_multiple_fridays,
             self.disperse_call,
             self.set_shift_expectations,
             self.friday_implies_saturday,
-            self.assign_claimed_days,
         ]
 
         if self.classification == 'junior':
@@ -423,29 +445,51 @@ class ResidentSchedulingSolver:
 
         # There must be a resident on shift
         for day in self.days:
-            if day not in self.nofill:
-                for shift in self.shifts:
-                    self.model.AddExactlyOne([self.schedules[resident['name']][day][shift] for resident in self.residents_info])
+            if day not in self.nofill_set:
+                for shift_index in range(self.shifts_per_day):
+                    self.model.AddExactlyOne(self.day_shift_roster[day][shift_index])
 
         # Try to avoid penalizing aspects of schedules
-        self.model.Minimize(sum(self.penalties))
+        penalty_vars, penalty_weights = zip(*self.penalty_terms)
+        self.model.Minimize(cp_model.LinearExpr.WeightedSum(penalty_vars, penalty_weights))
 
     def solve(self):
         self.solver = cp_model.CpSolver()
+        # Use the full CP-SAT portfolio (LNS, LP, core-based workers) rather than a single thread.
+        self.solver.parameters.num_search_workers = max(1, os.cpu_count() or 8)
+        self.solver.parameters.log_search_progress = False
+        # A near-optimal schedule is good enough; stop once the objective is within
+        # target_gap of the proven bound, or when the optional time budget runs out.
+        self.solver.parameters.relative_gap_limit = self.target_gap
+        if self.max_time_seconds is not None:
+            self.solver.parameters.max_time_in_seconds = self.max_time_seconds
         status = self.solver.Solve(self.model)
         if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
             print("Solution found!")
+            # Pull every assignment out of the solver once; reporting indexes this
+            # array instead of crossing into the solver per (day, shift) lookup.
+            self.values = {
+                name: np.array([[self.solver.BooleanValue(shift_var) for shift_var in day_vars]
+                                for day_vars in schedule], dtype=np.int8)
+                for name, schedule in self.schedules.items()
+            }
         else:
             print("No solution available.")
         self.status = status
 
     def print_schedule(self):
         if self.status == cp_model.OPTIMAL or self.status == cp_model.FEASIBLE:
-            for name, schedule in self.schedules.items():
+            # Stack every resident into one [resident, day, shift] array and tally
+            # all the summary counts in two reductions.
+            names = list(self.values.keys())
+            all_values = np.stack([self.values[name] for name in names], axis=0)
+            shift_totals = all_values.sum(axis=1)
+            weekend_totals = all_values[:, self.weekends_and_holidays, 0].sum(axis=1)
+            for resident_index, name in enumerate(names):
                 print(f"Shifts for {name:12}: ", end="")
-                for shift in self.shifts:
-                    print(f"{shift} shift: {sum(self.solver.BooleanValue(day[shift]) for day in schedule):02}    ", end="")
-                print(f"Weekend: {sum(self.solver.BooleanValue(schedule[day][self.shifts[0]]) for day in self.weekends_and_holidays)}")
+                for shift_index, shift in enumerate(self.shifts):
+                    print(f"{shift} shift: {shift_totals[resident_index, shift_index]:02}    ", end="")
+                print(f"Weekend: {weekend_totals[resident_index]}")
                 # print(f"{self.shifts[-1]} shifts for {name}: {sum(self.solver.BooleanValue(day[self.shifts[-1]]) for day in schedule)}")
                 # print(f"{self.shifts[0]} shifts for {name}: {sum(self.solver.BooleanValue(day[self.shifts[0]]) for day in schedule)}")
                 # print(f"{bounds[name][0]}: {self.solver.Value(bounds[name][0])} - {bounds[name][1]}: {self.solver.Value(bounds[name][1])}")
@@ -474,17 +518,13 @@ class ResidentSchedulingSolver:
                     adjusted_day = self.start_date + timedelta(day)
                     print(f"{adjusted_day.strftime('%b%d'):12}", end="")
                 print("")
-                for shift in self.shifts:
+                for shift_index in range(self.shifts_per_day):
                     for day in range(week * len(Weekday), (week + 1) * len(Weekday)):
                         found_person = False
-                        for name in self.schedules.keys():
-                            try:
-                                if self.solver.BooleanValue(self.schedules[name][day][shift]):
-                                    print(f"{name:12}", end="")
-                                    found_person = True
-                            except Exception as e:
-                                # print(f"{day=}{shift=}{name=}")
-                                pass
+                        for name in self.values.keys():
+                            if self.values[name][day, shift_index]:
+                                print(f"{name:12}", end="")
+                                found_person = True
                         if not found_person:
                             print("            ", end="")
                     print("")